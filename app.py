@@ -1,16 +1,100 @@
 # Enhanced Streamlit Dashboard with Advanced Styling (Dark Theme)
 
+import math
+
 import streamlit as st
-import pandas as pd
+import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
 from streamlit_extras.metric_cards import style_metric_cards
 
-# Load dataset
-df = pd.read_csv("infrastructure_lka_cleaned.csv")
+from data import (
+    downsample,
+    pick_indicators,
+    sector_indicator_map,
+    sector_list,
+    sector_slice,
+    select_rows,
+    to_csv_bytes,
+    values_by_indicator,
+    year_bounds,
+)
 
 # Page config
 st.set_page_config(page_title="Sri Lanka Infrastructure Dashboard", layout="wide")
 
+# Plotly config for decorative charts: no hover layer, zoom/pan handlers or modebar
+STATIC_CHART_CONFIG = {"staticPlot": True, "displayModeBar": False}
+
+# Figure builders, keyed on the filter values so repeat selections skip trace construction
+@st.cache_data(show_spinner=False)
+def build_trend_fig(sector, indicator, y0, y1):
+    filtered = select_rows(sector, indicator, y0, y1)
+    return px.line(downsample(filtered), x="Year", y="Value", title=f"{indicator} Over Time", markers=True,
+                   render_mode="webgl", template="plotly_dark")
+
+@st.cache_data(show_spinner=False)
+def build_growth_bar(sector, indicator, y0, y1):
+    filtered = select_rows(sector, indicator, y0, y1)
+    growth = (filtered.groupby(["Year", "Growth Label"], observed=True, sort=False)["Value"]
+              .sum().reset_index())
+    return px.bar(
+        growth, x="Year", y="Value", color="Growth Label", text="Growth Label",
+        title="Growth Classification",
+        template="plotly_dark",
+        color_discrete_map={"Surge": "lime", "Drop": "red", "Stable": "orange", "N/A": "gray"}
+    )
+
+@st.cache_data(show_spinner=False)
+def build_box_fig(indicator):
+    # Box statistics are computed here so only the outliers are sent as points
+    values = values_by_indicator()[indicator]
+    values = values[~np.isnan(values)]
+    fig_box = go.Figure()
+    if values.size:
+        q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+        outliers = values[(values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)]
+        fig_box.add_trace(go.Box(
+            q1=[q1], median=[median], q3=[q3],
+            lowerfence=[inside.min()], upperfence=[inside.max()],
+            y=[outliers.tolist()], name="", boxpoints="outliers", marker_color="#EF553B"
+        ))
+    fig_box.update_layout(
+        title=f"Distribution of '{indicator}' (1960–2023)",
+        template="plotly_dark",
+        xaxis_title=None,
+        yaxis_title="Value",
+        showlegend=False
+    )
+    return fig_box
+
+@st.cache_data(show_spinner=False)
+def build_area_fig(sector, indicator, y0, y1):
+    area_df = downsample(select_rows(sector, indicator, y0, y1))
+    fig_area = go.Figure(go.Scattergl(x=area_df["Year"], y=area_df["Value"], mode="lines",
+                                      fill="tozeroy", line_color="#00CC96"))
+    fig_area.update_layout(title="Cumulative Progression", xaxis_title="Year", yaxis_title="Value",
+                           template="plotly_dark")
+    return fig_area
+
+@st.cache_data(show_spinner=False)
+def build_multi_line_fig(sector, indicators, y0, y1):
+    multi_df = select_rows(sector, indicators, y0, y1)
+    return px.line(
+        downsample(multi_df, by="Indicator Name"), x="Year", y="Value", color="Indicator Name", markers=True,
+        render_mode="webgl", template="plotly_dark"
+    )
+
+@st.cache_data(show_spinner=False)
+def build_multi_box_fig(sector, indicators, y0, y1):
+    multi_df = select_rows(sector, indicators, y0, y1)
+    return px.box(
+        multi_df, x="Indicator Name", y="Value", color="Indicator Name",
+        template="plotly_dark"
+    )
+
 # Apply dark theme custom fonts and styling
 st.markdown("""
     <style>
@@ -62,24 +146,27 @@ elif page == "Dashboard":
 
     # Sidebar Filters
     st.sidebar.header("📌 Filters")
-    selected_sector = st.sidebar.selectbox("Select Sector", sorted(df["Sector"].unique()))
-    indicators = df[df["Sector"] == selected_sector]["Indicator Name"].unique()
-    selected_indicator = st.sidebar.selectbox("Select Indicator", sorted(indicators))
-    year_range = st.sidebar.slider("Select Year Range", int(df["Year"].min()), int(df["Year"].max()), (2000, 2023))
-
-    filtered = df[
-        (df["Sector"] == selected_sector) &
-        (df["Indicator Name"] == selected_indicator) &
-        (df["Year"].between(year_range[0], year_range[1]))
-    ]
+    selected_sector = st.sidebar.selectbox("Select Sector", sector_list())
+    indicators = sector_indicator_map()[selected_sector]
+    selected_indicator = st.sidebar.selectbox("Select Indicator", indicators)
+    year_min, year_max = year_bounds()
+    year_range = st.sidebar.slider("Select Year Range", year_min, year_max, (2000, 2023))
+
+    y0, y1 = year_range
+    sector_df = sector_slice(selected_sector, y0, y1)
+    filtered = pick_indicators(sector_df, selected_indicator)
+    if filtered.empty:
+        st.info("No data for this selection.")
+        st.stop()
 
     # KPI Metrics
     st.subheader("📌 Key Metrics")
-    latest = filtered.sort_values("Year", ascending=False).iloc[0]
+    latest = filtered.loc[filtered["Year"].idxmax()]
+    yoy_na = math.isnan(latest["YoY Change (%)"])
     k1, k2, k3 = st.columns(3)
     k1.metric("📅 Year", latest["Year"])
     k2.metric("📈 Latest Value", f"{latest['Value']:.2f}")
-    k3.metric("📊 YoY Change", f"{latest['YoY Change (%)']:.2f}" if not pd.isna(latest['YoY Change (%)']) else "N/A")
+    k3.metric("📊 YoY Change", f"{latest['YoY Change (%)']:.2f}" if not yoy_na else "N/A")
     
     # Style metric cards (Dark Theme)
     style_metric_cards(
@@ -92,42 +179,23 @@ elif page == "Dashboard":
 
     # Line Chart
     st.subheader("📈 Trend Over Time")
-    fig_trend = px.line(filtered, x="Year", y="Value", title=f"{selected_indicator} Over Time", markers=True,
-                        template="plotly_dark")
+    fig_trend = build_trend_fig(selected_sector, selected_indicator, y0, y1)
     st.plotly_chart(fig_trend, use_container_width=True)
 
     # Growth Label Bar
     st.subheader("Growth Label by Year")
-    fig_growth = px.bar(
-        filtered, x="Year", y="Value", color="Growth Label", text="Growth Label",
-        title="Growth Classification",
-        template="plotly_dark",
-        color_discrete_map={"Surge": "lime", "Drop": "red", "Stable": "orange", "N/A": "gray"}
-    )
-    st.plotly_chart(fig_growth, use_container_width=True)
+    fig_growth = build_growth_bar(selected_sector, selected_indicator, y0, y1)
+    st.plotly_chart(fig_growth, use_container_width=True, config=STATIC_CHART_CONFIG)
 
     # Box Plot (Individual)
     st.subheader("Box Plot: Indicator Value Distribution")
-    fig_box = px.box(
-        df[df["Indicator Name"] == selected_indicator],
-        y="Value",
-        points="all",
-        title=f"Distribution of '{selected_indicator}' (1960–2023)",
-        color_discrete_sequence=["#EF553B"],
-        template="plotly_dark"
-    )
-    fig_box.update_layout(
-        xaxis_title=None,
-        yaxis_title="Value",
-        showlegend=False
-    )
+    fig_box = build_box_fig(selected_indicator)
     st.plotly_chart(fig_box, use_container_width=True)
 
     # Area Chart
     st.subheader("Area Chart View")
-    fig_area = px.area(filtered, x="Year", y="Value", title="Cumulative Progression",
-                       color_discrete_sequence=["#00CC96"], template="plotly_dark")
-    st.plotly_chart(fig_area, use_container_width=True)
+    fig_area = build_area_fig(selected_sector, selected_indicator, y0, y1)
+    st.plotly_chart(fig_area, use_container_width=True, config=STATIC_CHART_CONFIG)
 
     # Multi-Indicator Comparison (Improved Layout)
     st.markdown("## 📊 Multi-Indicator Comparison")
@@ -135,36 +203,26 @@ elif page == "Dashboard":
     st.sidebar.subheader("📌 Compare Multiple Indicators")
     compare_inds = st.sidebar.multiselect(
         "Select Indicators (within the same sector):", 
-        df[df["Sector"] == selected_sector]["Indicator Name"].unique(),
+        indicators,
         default=[selected_indicator]
     )
-    multi_df = df[
-        (df["Sector"] == selected_sector) &
-        (df["Indicator Name"].isin(compare_inds)) &
-        (df["Year"].between(year_range[0], year_range[1]))
-    ]
+    multi_df = pick_indicators(sector_df, tuple(compare_inds))
     if not multi_df.empty:
         # Line chart
         st.subheader("📈 Trend Comparison")
-        fig_multi_line = px.line(
-            multi_df, x="Year", y="Value", color="Indicator Name", markers=True,
-            template="plotly_dark"
-        )
+        fig_multi_line = build_multi_line_fig(selected_sector, tuple(compare_inds), y0, y1)
         st.plotly_chart(fig_multi_line, use_container_width=True)
 
         # Box chart
         st.subheader("📊 Distribution Comparison")
-        fig_multi_box = px.box(
-            multi_df, x="Indicator Name", y="Value", color="Indicator Name",
-            template="plotly_dark"
-        )
+        fig_multi_box = build_multi_box_fig(selected_sector, tuple(compare_inds), y0, y1)
         st.plotly_chart(fig_multi_box, use_container_width=True)
 
 
     # Insights
     with st.expander("💡 Key Takeaways"):
         st.write(f"- **{selected_indicator}** in **{selected_sector}** peaked at **{latest['Value']:.2f}** in **{latest['Year']}**.")
-        if not pd.isna(latest["YoY Change (%)"]):
+        if not yoy_na:
             st.write(f"- This was a change of **{latest['YoY Change (%)']:.2f}%** from the previous year.")
         st.write("- Use box plots to identify variability and stability.")
         st.write("- Compare multiple indicators to understand trends across the sector.")
@@ -172,7 +230,7 @@ elif page == "Dashboard":
     # Download Button
     st.sidebar.download_button(
         "⬇️ Download Filtered Data",
-        filtered.to_csv(index=False),
+        to_csv_bytes(selected_sector, selected_indicator, y0, y1),
         file_name="filtered_infra_data.csv",
         mime="text/csv"
     )
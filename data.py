@@ -0,0 +1,105 @@
+# Shared data loading, indexing and caching helpers for the dashboard
+
+import io
+
+import streamlit as st
+import numpy as np
+import pandas as pd
+
+# Load dataset (parsed once and shared read-only across reruns and sessions)
+@st.cache_resource(show_spinner=False)
+def load_df():
+    return pd.read_csv(
+        "infrastructure_lka_cleaned.csv",
+        dtype={
+            "Country Name": "category",
+            "Sector": "category",
+            "Indicator Name": "category",
+            "Indicator Code": "category",
+            "Growth Label": "category",
+            "Year": "int16",
+        },
+        engine="c",
+        memory_map=True,
+    )
+
+# Largest-Triangle-Three-Buckets downsampling so long traces only ship the points that shape the line
+MAX_TRACE_POINTS = 800
+
+def lttb_indices(x, y, n_out):
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    out = np.empty(n_out, dtype=int)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+def downsample(frame, by=None, n_out=MAX_TRACE_POINTS):
+    # Every group fits when the whole frame does, so skip the groupby/concat pass entirely
+    if len(frame) <= n_out:
+        return frame
+    if by is not None:
+        return pd.concat([downsample(g, n_out=n_out) for _, g in frame.groupby(by, observed=True, sort=False)])
+    frame = frame.dropna(subset=["Value"]).sort_values("Year")
+    keep = lttb_indices(frame["Year"].to_numpy(dtype=float), frame["Value"].to_numpy(dtype=float), n_out)
+    return frame.iloc[keep]
+
+# Lookup tables for the sidebar filters, built once from the shared frame (no per-rerun hashing)
+@st.cache_data(show_spinner=False)
+def sector_indicator_map():
+    df = load_df()
+    return {
+        s: tuple(sorted(df.loc[df["Sector"] == s, "Indicator Name"].unique()))
+        for s in df["Sector"].unique()
+    }
+
+@st.cache_data(show_spinner=False)
+def sector_list():
+    return sorted(load_df()["Sector"].unique())
+
+# Sorted (Sector, Indicator Name, Year) index over the shared frame; the keys stay as columns too
+@st.cache_resource(show_spinner=False)
+def indexed():
+    return load_df().set_index(["Sector", "Indicator Name", "Year"], drop=False).sort_index()
+
+@st.cache_data(show_spinner=False)
+def values_by_indicator():
+    return {ind: g["Value"].to_numpy() for ind, g in load_df().groupby("Indicator Name", observed=True, sort=False)}
+
+@st.cache_data(show_spinner=False)
+def year_bounds():
+    years = load_df()["Year"]
+    return int(years.min()), int(years.max())
+
+# Serialized download payload, keyed on the filter values so reruns only hash primitives
+@st.cache_data(show_spinner=False)
+def to_csv_bytes(sector, indicator, y0, y1):
+    df = select_rows(sector, indicator, y0, y1)
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False)
+    return buf.getvalue()
+
+# One sector's rows within a year range, still indexed so indicators can be picked from it
+def sector_slice(sector, y0, y1):
+    return indexed().loc[pd.IndexSlice[sector, :, y0:y1], :]
+
+# Rows for one indicator (str) or several (tuple) out of a sector_slice
+def pick_indicators(sliced, indicators):
+    names = [indicators] if isinstance(indicators, str) else list(indicators)
+    present = set(sliced.index.unique("Indicator Name"))
+    names = [n for n in names if n in present]
+    if not names:
+        return sliced.iloc[0:0].reset_index(drop=True)
+    return sliced.loc[pd.IndexSlice[:, names, :], :].reset_index(drop=True)
+
+def select_rows(sector, indicators, y0, y1):
+    return pick_indicators(sector_slice(sector, y0, y1), indicators)